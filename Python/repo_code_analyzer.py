@@ -5,20 +5,32 @@ Replicates the behavior of repo_code_analyzer.R and shiny_cost_estimator.R
 
 Usage:
   python3 Python/repo_code_analyzer.py analyze [path] [--avg-wage AVG] \
-       [--complexity low|medium|high] [--team-exp N] [--reuse FLOAT] [--tools FLOAT]
+       [--complexity low|medium|high] [--team-exp N] [--reuse FLOAT] [--tools FLOAT] \
+       [--force-python] [--processes] [--max-bytes N]
 
   python3 Python/repo_code_analyzer.py estimate --lines N [--complexity low|medium|high] \
        [--team-exp N] [--reuse FLOAT] [--tools FLOAT]
 
 Outputs an scc-style report to stdout and prints cost estimation details.
+When the scc binary is on PATH, analyze uses it for line counting; pass
+--force-python to always use the built-in counter. --processes and
+--max-bytes only affect the built-in counter; scc ignores them.
 """
 
+import codecs
+import io
+import json
+import mmap
 import os
+import shutil
+import subprocess
 import sys
 import argparse
 import re
 from collections import defaultdict
-from math import pow
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 
 
 LANG_MAP = {
@@ -32,25 +44,47 @@ LANG_MAP = {
     '.h': 'C Header', '.java': 'Java', '.sql': 'SQL'
 }
 
-COMMENT_PATTERNS = {
-    'R': [r'^\s*#'],
-    'JavaScript': [r'^\s*//', r'^\s*/\*', r'^\s*\*'],
-    'TypeScript': [r'^\s*//', r'^\s*/\*', r'^\s*\*'],
-    'CSS': [r'^\s*/\*', r'^\s*\*'],
-    'Sass': [r'^\s*//', r'^\s*/\*', r'^\s*\*'],
-    'HTML': [r'^\s*<!--'],
-    'Python': [r'^\s*#'],
-    'Shell': [r'^\s*#'],
-    'SQL': [r'^\s*--', r'^\s*/\*', r'^\s*\*'],
-    'C': [r'^\s*//', r'^\s*/\*', r'^\s*\*'],
-    'C++': [r'^\s*//', r'^\s*/\*', r'^\s*\*'],
-    'Java': [r'^\s*//', r'^\s*/\*', r'^\s*\*']
+# Comment markers are literal prefixes of the left-stripped line. Languages
+# with the same syntax share one tuple, and so one cached _make_counter
+HASH_COMMENTS = (b'#',)
+C_FAMILY_COMMENTS = (b'//', b'/*', b'*')
+
+COMMENT_PREFIXES = {
+    'R': HASH_COMMENTS,
+    'JavaScript': C_FAMILY_COMMENTS,
+    'TypeScript': C_FAMILY_COMMENTS,
+    'CSS': (b'/*', b'*'),
+    'Sass': C_FAMILY_COMMENTS,
+    'HTML': (b'<!--',),
+    'Python': HASH_COMMENTS,
+    'Shell': HASH_COMMENTS,
+    'SQL': (b'--', b'/*', b'*'),
+    'C': C_FAMILY_COMMENTS,
+    'C++': C_FAMILY_COMMENTS,
+    'Java': C_FAMILY_COMMENTS
 }
 
-EXCLUDE_PATTERNS = [
-    '/.git/', '/.Rproj.user/', '/node_modules/', '/.venv/', '/venv/',
-    '/__pycache__/', '/.DS_Store', '/.Rhistory', '/.RData', '/packrat/', '/renv/'
-]
+# Unanchored keyword alternations: a leading literal lets the re engine skip
+# ahead to candidate positions; see _count_matching_lines for line counting
+JS_COMPLEXITY_RE = re.compile(rb'function\s|=>|for[^\S\n]*\(|while[^\S\n]*\(|if[^\S\n]*\(|class\s')
+
+COMPLEXITY_RE = {
+    'R': re.compile(rb'function[^\S\n]*\(|for[^\S\n]*\(|while[^\S\n]*\(|if[^\S\n]*\('),
+    'JavaScript': JS_COMPLEXITY_RE,
+    'TypeScript': JS_COMPLEXITY_RE,
+    'Python': re.compile(rb'def\s|class\s|for\s|while\s|if\s')
+}
+
+# Directory names pruned from the walk, and name prefixes skipped for any
+# entry (the R version's exclude_patterns, matched per path component)
+EXCLUDE_DIRNAMES = frozenset({
+    '.git', '.Rproj.user', 'node_modules', '.venv', 'venv',
+    '__pycache__', 'packrat', 'renv'
+})
+EXCLUDE_NAME_PREFIXES = ('.DS_Store', '.Rhistory', '.RData')
+
+# The name prefixes as an scc --not-match pattern (Go regexp syntax)
+SCC_NOT_MATCH = '^(?:' + '|'.join(re.escape(p) for p in EXCLUDE_NAME_PREFIXES) + ')'
 
 BINARY_EXTENSIONS = {
     '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.tiff', '.webp',
@@ -63,104 +97,283 @@ BINARY_EXTENSIONS = {
     '.sqlite', '.db', '.exe', '.bin', '.dat', '.lock',
 }
 
+# Everything the counter needs per extension in one lookup:
+# (language, comment prefixes, complexity pattern), or None for binaries
+EXT_INFO = {
+    ext: (language, COMMENT_PREFIXES.get(language), COMPLEXITY_RE.get(language))
+    for ext, language in LANG_MAP.items()
+}
+EXT_INFO.update(dict.fromkeys(BINARY_EXTENSIONS))
+OTHER_INFO = ('Other', None, None)
+
+SUMMARY_FIELDS = ('Files', 'Lines', 'Blanks', 'Comments', 'Code', 'Complexity', 'Bytes')
+
+# Report table layout shared by the console report and the txt export
+TABLE_HEADER = (f"{'Language':<20} {'Files':>9} {'Lines':>9} {'Blanks':>9} "
+                f"{'Comments':>9} {'Code':>9} {'Complexity':>10}")
+ROW_FMT = '{0:<20} {Files:9d} {Lines:9d} {Blanks:9d} {Comments:9d} {Code:9d} {Complexity:10d}'
+
+# A NUL byte within this many leading bytes marks a file as binary
+BINARY_SNIFF_BYTES = 8192
+
+# Files larger than this (usually minified or generated) only add Lines and
+# Bytes; they contribute no Code to the estimate. 0 disables the limit
+DEFAULT_MAX_BYTES = 5 * 1000 * 1000
+
+# Slice size for counting newlines in those files without copying them whole
+LINE_COUNT_CHUNK = 1 << 20
+
+# Allowed (low, high) range per estimate_shiny_cost argument, in check order
+PARAM_RANGES = {
+    'team_experience': (1, 5),
+    'reuse_factor': (0.7, 1.3),
+    'tool_support': (0.8, 1.2),
+    'rely': (0.82, 1.26),
+    'cplx': (0.73, 1.74),
+    'ruse': (0.95, 1.24),
+    'pcon': (0.81, 1.29),
+    'apex': (0.81, 1.22),
+    'maintenance_rate': (0, 1)
+}
 
-def is_excluded(path):
-    for p in EXCLUDE_PATTERNS:
-        if p in path:
-            return True
-    return False
+LANG_PRODUCTIVITY = {
+    'R': 1.0, 'Python': 1.1, 'SQL': 1.3, 'JavaScript': 0.9,
+    'CSS': 1.2, 'HTML': 1.3, 'Markdown': 1.5, 'Quarto': 1.5, 'YAML': 1.5, 'JSON': 1.5
+}
 
+# COCOMO II effort exponent B per complexity, and the schedule exponent D
+# derived from it
+B_TABLE = {'low': 1.02, 'medium': 1.10, 'high': 1.18}
+D_TABLE = {k: 0.28 + 0.2 * (b - 1.01) for k, b in B_TABLE.items()}
+
+
+def _count_matching_lines(pattern, data):
+    # Count lines with at least one match: after each hit, resume the search
+    # at the start of the next line so further hits on that line are skipped
+    count = 0
+    pos = 0
+    search = pattern.search
+    find = data.find
+    while True:
+        m = search(data, pos)
+        if m is None:
+            return count
+        count += 1
+        pos = find(b'\n', m.start()) + 1
+        if not pos:
+            return count
+
+
+@lru_cache(maxsize=None)
+def _make_counter(prefixes, complexity_re):
+    # Build a (lines, blanks, comments, complexity) counter with one
+    # language's rules bound in; cached, so languages that share comment
+    # prefixes and complexity pattern share one counter
+    startswith = bytes.startswith
+    lstrip = bytes.lstrip
+
+    def count_lines(data):
+        # A trailing newline ends the last line rather than starting a new one
+        lines = data.split(b'\n')
+        if not lines[-1]:
+            lines.pop()
+        stripped = list(map(lstrip, lines))
+        comments = 0
+        # A memchr-backed substring check skips the per-line prefix test
+        # for files (often minified or generated) with no comment marker
+        if prefixes and any(p in data for p in prefixes):
+            comments = sum(map(startswith, stripped, repeat(prefixes)))
+        complexity = _count_matching_lines(complexity_re, data) if complexity_re else 0
+        return len(lines), stripped.count(b''), comments, complexity
+
+    return count_lines
+
+
+# (language, counter) per raw file suffix, filled on first use so repeated
+# extensions cost a single dict probe with no lower() call
+_SUFFIX_CACHE = {}
+
+
+def file_info(name):
+    # Same split as os.path.splitext: leading dots do not start an extension
+    dot = name.rfind('.')
+    if dot > 0 and name[:dot].lstrip('.'):
+        suffix = name[dot:]
+    else:
+        upper = name.upper()
+        suffix = '.license' if 'LICENSE' in upper or 'LICENCE' in upper else ''
+    try:
+        return _SUFFIX_CACHE[suffix]
+    except KeyError:
+        info = EXT_INFO.get(suffix.lower(), OTHER_INFO)
+        if info is not None:
+            language, prefixes, complexity_re = info
+            info = (language, _make_counter(prefixes, complexity_re))
+        _SUFFIX_CACHE[suffix] = info
+        return info
+
+
+def _analyze_file(full, name, file_size, max_bytes=0):
+    info = file_info(name)
+    if info is None:
+        return None
+    language, count_lines = info
+    if not file_size:
+        return (language, 0, 0, 0, 0, 0, 0)
 
-def is_binary_file(filepath):
-    ext = os.path.splitext(filepath)[1].lower()
-    if ext in BINARY_EXTENSIONS:
-        return True
+    # One open serves both the binary sniff and the counting
     try:
-        with open(filepath, 'rb') as fh:
-            chunk = fh.read(8192)
-            if not chunk:
-                return False
-            return b'\x00' in chunk
+        with open(full, 'rb', buffering=0) as raw:
+            with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b'\x00', 0, BINARY_SNIFF_BYTES) != -1:
+                    return None
+                if max_bytes and file_size > max_bytes:
+                    # Same line count as the split in count_lines, in
+                    # bounded slices so memory stays flat for huge files
+                    total_lines = mm[-1:] != b'\n'
+                    for start in range(0, len(mm), LINE_COUNT_CHUNK):
+                        total_lines += mm[start:start + LINE_COUNT_CHUNK].count(b'\n')
+                    return (language, total_lines, 0, 0, 0, 0, file_size)
+                # Drop a UTF-8 BOM so it cannot hide a first-line comment
+                # or blank; slicing past it costs no extra copy
+                data = mm[3:] if mm[:3] == codecs.BOM_UTF8 else mm[:]
+        total_lines, blank_lines, comment_lines, complexity_count = count_lines(data)
     except Exception:
-        return False
+        return None
 
+    return (language, total_lines, blank_lines, comment_lines,
+            total_lines - blank_lines - comment_lines, complexity_count, file_size)
 
-def analyze_repo(path='.'):
-    results = []
-    for root, dirs, files in os.walk(path):
-        for f in files:
-            full = os.path.join(root, f)
-            rel = os.path.relpath(full, path)
-            if is_excluded(full):
-                continue
-            if is_binary_file(full):
-                continue
+
+def _summarize_with_scc(path):
+    # Optional fast path: scc (https://github.com/boyter/scc) walks and counts
+    # natively; returns None when it is not installed or fails to run
+    scc = shutil.which('scc')
+    if scc is None:
+        return None
+    try:
+        # Apply the same exclusions as _iter_files so both backends count
+        # the same files (scc's own default only skips VCS directories)
+        cmd = [scc, '--format', 'json',
+               '--exclude-dir', ','.join(sorted(EXCLUDE_DIRNAMES)),
+               '--not-match', SCC_NOT_MATCH, path]
+        proc = subprocess.run(cmd, capture_output=True, check=True)
+        languages = json.loads(proc.stdout)
+        # An unexpected JSON shape also falls back to the built-in counter
+        lang_summary = {}
+        for entry in languages or []:
+            lang_summary[entry['Name']] = {
+                'Files': entry['Count'],
+                'Lines': entry['Lines'],
+                'Blanks': entry['Blank'],
+                'Comments': entry['Comment'],
+                'Code': entry['Code'],
+                'Complexity': entry['Complexity'],
+                'Bytes': entry['Bytes']
+            }
+    except (OSError, subprocess.CalledProcessError, ValueError, KeyError, TypeError):
+        return None
+    return lang_summary
+
+
+def _iter_files(path):
+    # Yield (path, name, size) for each file in os.walk order. Excluded
+    # directories are pruned before descending; path, name and size all come
+    # from the DirEntry, so no path strings are joined or split per file.
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return
+    subdirs = []
+    with entries:
+        for entry in entries:
             try:
-                ext = os.path.splitext(f)[1].lower()
-                if ext == '' and re.search(r'LICENSE|LICENCE', f, re.I):
-                    ext = '.license'
-                language = LANG_MAP.get(ext, 'Other')
-
-                with open(full, 'r', encoding='utf-8', errors='ignore') as fh:
-                    lines = fh.readlines()
-            except Exception:
+                name = entry.name
+                if name.startswith(EXCLUDE_NAME_PREFIXES):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in EXCLUDE_DIRNAMES:
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path, name, entry.stat().st_size
+            except OSError:
                 continue
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
+
+def _summarize_files(path, max_workers=None, processes=False, max_bytes=0):
+    # Walk first, then analyze the candidate files concurrently; reads
+    # overlap on a thread pool and results keep the walk order. With
+    # processes=True the regex/split work runs on a process pool instead,
+    # sidestepping the GIL on large CPU-bound repositories. Returns the
+    # per-language summary and the number of files over max_bytes
+    fulls = []
+    names = []
+    sizes = []
+    for full, name, size in _iter_files(path):
+        fulls.append(full)
+        names.append(name)
+        sizes.append(size)
+
+    if processes:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        # Batch files per task to amortize pickling and IPC
+        map_kwargs = {'chunksize': 32}
+    else:
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        map_kwargs = {}
+
+    # Aggregate by language as results arrive, in SUMMARY_FIELDS order
+    counts = defaultdict(lambda: [0] * len(SUMMARY_FIELDS))
+    skipped = 0
+    with pool:
+        for r in pool.map(_analyze_file, fulls, names, sizes, repeat(max_bytes),
+                          **map_kwargs):
+            if r is None:
+                continue
+            language, lines, blanks, comments, code, complexity, size = r
+            s = counts[language]
+            s[0] += 1
+            s[1] += lines
+            s[2] += blanks
+            s[3] += comments
+            s[4] += code
+            s[5] += complexity
+            s[6] += size
+            if max_bytes and size > max_bytes:
+                skipped += 1
+    return {L: dict(zip(SUMMARY_FIELDS, s)) for L, s in counts.items()}, skipped
+
+
+def format_row(label, stats):
+    return ROW_FMT.format(label, **stats)
+
+
+def lines_only_note(totals):
+    # Note for the console report and every export when files over
+    # --max-bytes were counted for Lines/Bytes only; None when there were none
+    count = totals.get('LinesOnlyFiles', 0)
+    if not count:
+        return None
+    return f"Counted only lines in {count:,} file(s) over {totals['MaxBytes']:,} bytes (see --max-bytes)"
 
-            total_lines = len(lines)
-            blank_lines = sum(1 for L in lines if re.match(r'^\s*$', L))
-
-            # Single-pass OR to avoid double-counting comments
-            patterns = COMMENT_PATTERNS.get(language, [])
-            if patterns:
-                compiled = [re.compile(pat) for pat in patterns]
-                comment_lines = sum(
-                    1 for L in lines
-                    if any(prog.search(L) for prog in compiled)
-                )
-            else:
-                comment_lines = 0
-
-            code_lines = total_lines - blank_lines - comment_lines
-
-            complexity_count = 0
-            if language == 'R':
-                complexity_count = sum(1 for L in lines if re.search(r'function\s*\(|for\s*\(|while\s*\(|if\s*\(', L))
-            elif language in ('JavaScript', 'TypeScript'):
-                complexity_count = sum(1 for L in lines if re.search(r'function\s+|=>|for\s*\(|while\s*\(|if\s*\(|class\s+', L))
-            elif language == 'Python':
-                complexity_count = sum(1 for L in lines if re.search(r'def\s+|class\s+|for\s+|while\s+|if\s+', L))
-
-            file_size = os.path.getsize(full)
-
-            results.append({
-                'Language': language,
-                'File': rel,
-                'Lines': total_lines,
-                'Blanks': blank_lines,
-                'Comments': comment_lines,
-                'Code': code_lines,
-                'Complexity': complexity_count,
-                'Bytes': file_size
-            })
-
-    if not results:
+
+def analyze_repo(path='.', max_workers=None, force_python=False, processes=False,
+                 max_bytes=DEFAULT_MAX_BYTES):
+    lang_summary = None
+    skipped = 0
+    if not force_python:
+        lang_summary = _summarize_with_scc(path)
+    if lang_summary is None:
+        lang_summary, skipped = _summarize_files(path, max_workers, processes, max_bytes)
+
+    if not lang_summary:
         print('No files found to analyze.')
         return None
 
-    # Aggregate by language
-    lang_summary = {}
-    for r in results:
-        L = r['Language']
-        if L not in lang_summary:
-            lang_summary[L] = {'Files': 0, 'Lines': 0, 'Blanks': 0, 'Comments': 0, 'Code': 0, 'Complexity': 0, 'Bytes': 0}
-        lang_summary[L]['Files'] += 1
-        lang_summary[L]['Lines'] += r['Lines']
-        lang_summary[L]['Blanks'] += r['Blanks']
-        lang_summary[L]['Comments'] += r['Comments']
-        lang_summary[L]['Code'] += r['Code']
-        lang_summary[L]['Complexity'] += r['Complexity']
-        lang_summary[L]['Bytes'] += r['Bytes']
-
     # Sort by Code desc
     sorted_langs = sorted(lang_summary.items(), key=lambda kv: -kv[1]['Code'])
 
@@ -169,18 +382,26 @@ def analyze_repo(path='.'):
     for L, stats in sorted_langs:
         for k in totals:
             totals[k] += stats[k]
-
-    # Print report
-    print('\n' + '-' * 79)
-    print(f"{ 'Language':<20} { 'Files':>9} { 'Lines':>9} { 'Blanks':>9} { 'Comments':>9} { 'Code':>9} { 'Complexity':>10}")
-    print('-' * 79)
+    # Carried with the totals so the exports can repeat the lines-only note
+    totals['LinesOnlyFiles'] = skipped
+    totals['MaxBytes'] = max_bytes
+
+    # Print report with a single write
+    out = ['', '-' * 79]
+    out.append(TABLE_HEADER)
+    out.append('-' * 79)
     for L, s in sorted_langs:
-        print(f"{L:<20} {s['Files']:9d} {s['Lines']:9d} {s['Blanks']:9d} {s['Comments']:9d} {s['Code']:9d} {s['Complexity']:10d}")
-    print('-' * 79)
-    print(f"{'Total':<20} {totals['Files']:9d} {totals['Lines']:9d} {totals['Blanks']:9d} {totals['Comments']:9d} {totals['Code']:9d} {totals['Complexity']:10d}")
-    print('-' * 79)
-    print(f"Processed {totals['Bytes']:,} bytes, {totals['Bytes'] / 1000000:.3f} megabytes (SI)")
-    print('-' * 79 + '\n')
+        out.append(format_row(L, s))
+    out.append('-' * 79)
+    out.append(format_row('Total', totals))
+    out.append('-' * 79)
+    out.append(f"Processed {totals['Bytes']:,} bytes, {totals['Bytes'] / 1000000:.3f} megabytes (SI)")
+    note = lines_only_note(totals)
+    if note:
+        out.append(note)
+    out.append('-' * 79)
+    out.append('')
+    sys.stdout.write('\n'.join(out) + '\n')
 
     return lang_summary, totals
 
@@ -188,98 +409,114 @@ def analyze_repo(path='.'):
 def write_csv(basepath, lang_summary, totals, est):
     import csv
     csv_path = basepath + '.csv'
+    # Build every row first and hand them to the writer in one call
+    rows = [['Language', 'Files', 'Lines', 'Blanks', 'Comments', 'Code', 'Complexity', 'Bytes']]
+    rows.extend([L, s['Files'], s['Lines'], s['Blanks'], s['Comments'], s['Code'], s['Complexity'], s['Bytes']]
+                for L, s in sorted(lang_summary.items(), key=lambda kv: -kv[1]['Code']))
+    rows.append([])
+    rows.append(['Total', totals['Files'], totals['Lines'], totals['Blanks'], totals['Comments'], totals['Code'], totals['Complexity'], totals['Bytes']])
+    note = lines_only_note(totals)
+    if note:
+        rows.append([note])
+    rows.append([])
+    rows.append(['Estimate', 'Value'])
+    rows.append(['Estimated Cost (USD)', est.get('realistic_cost_usd', est.get('estimated_cost_usd'))])
+    rows.append(['Estimated Schedule (months)', est.get('final_schedule_months', est.get('schedule_months'))])
+    rows.append(['Estimated People', est.get('final_people', est.get('people_required'))])
+    rows.append([])
+    rows.append(['Realistic Project Breakdown', ''])
+    rows.append(['Total effort (person-months)', est.get('original_effort')])
+    rows.append(['Team size (people)', est.get('final_people')])
+    rows.append(['Timeline (months)', est.get('final_schedule_months')])
+    rows.append(['Average monthly cost (USD/month)', est.get('average_monthly_cost')])
+    ci = est.get('confidence_interval', {})
+    if ci:
+        rows.append(['Confidence low', ci.get('low')])
+        rows.append(['Confidence high', ci.get('high')])
     with open(csv_path, 'w', newline='', encoding='utf-8') as fh:
-        writer = csv.writer(fh)
-        writer.writerow(['Language', 'Files', 'Lines', 'Blanks', 'Comments', 'Code', 'Complexity', 'Bytes'])
-        for L, s in sorted(lang_summary.items(), key=lambda kv: -kv[1]['Code']):
-            writer.writerow([L, s['Files'], s['Lines'], s['Blanks'], s['Comments'], s['Code'], s['Complexity'], s['Bytes']])
-        writer.writerow([])
-        writer.writerow(['Total', totals['Files'], totals['Lines'], totals['Blanks'], totals['Comments'], totals['Code'], totals['Complexity'], totals['Bytes']])
-        writer.writerow([])
-        writer.writerow(['Estimate', 'Value'])
-        writer.writerow(['Estimated Cost (USD)', est.get('realistic_cost_usd', est.get('estimated_cost_usd'))])
-        writer.writerow(['Estimated Schedule (months)', est.get('final_schedule_months', est.get('schedule_months'))])
-        writer.writerow(['Estimated People', est.get('final_people', est.get('people_required'))])
-        writer.writerow([])
-        writer.writerow(['Realistic Project Breakdown', ''])
-        writer.writerow(['Total effort (person-months)', est.get('original_effort')])
-        writer.writerow(['Team size (people)', est.get('final_people')])
-        writer.writerow(['Timeline (months)', est.get('final_schedule_months')])
-        writer.writerow(['Average monthly cost (USD/month)', est.get('average_monthly_cost')])
-        ci = est.get('confidence_interval', {})
-        if ci:
-            writer.writerow(['Confidence low', ci.get('low')])
-            writer.writerow(['Confidence high', ci.get('high')])
+        csv.writer(fh).writerows(rows)
 
 
 def write_html(basepath, lang_summary, totals, est):
     html_path = basepath + '.html'
+    # Collect the page in a list and write it to disk once
+    parts = []
+    parts.append('<html><head><meta charset="utf-8"><title>Repo Analysis</title></head><body>')
+    parts.append('<h1>Repository Code Analysis</h1>')
+    parts.append('<table border="1" cellpadding="6" cellspacing="0">')
+    parts.append('<tr><th>Language</th><th>Files</th><th>Lines</th><th>Blanks</th><th>Comments</th><th>Code</th><th>Complexity</th><th>Bytes</th></tr>')
+    for L, s in sorted(lang_summary.items(), key=lambda kv: -kv[1]['Code']):
+        parts.append(f"<tr><td>{L}</td><td>{s['Files']}</td><td>{s['Lines']}</td><td>{s['Blanks']}</td><td>{s['Comments']}</td><td>{s['Code']}</td><td>{s['Complexity']}</td><td>{s['Bytes']}</td></tr>")
+    parts.append('</table>')
+    parts.append('<h2>Totals</h2>')
+    parts.append(f"<p>Files: {totals['Files']} &nbsp; Lines: {totals['Lines']} &nbsp; Code: {totals['Code']}</p>")
+    note = lines_only_note(totals)
+    if note:
+        parts.append(f"<p>{note}</p>")
+    parts.append('<h2>Estimate</h2>')
+    parts.append(f"<p>Estimated Cost (USD): ${est.get('realistic_cost_usd', est.get('estimated_cost_usd')):,}</p>")
+    parts.append(f"<p>Estimated Schedule (months): {est.get('final_schedule_months', est.get('schedule_months'))}</p>")
+    parts.append(f"<p>Estimated People: {est.get('final_people', est.get('people_required'))}</p>")
+    ci = est.get('confidence_interval', {})
+    if ci:
+        parts.append(f"<p>Confidence Range: ${ci.get('low', 0):,} - ${ci.get('high', 0):,}</p>")
+    parts.append('<h3>Realistic Project Breakdown</h3>')
+    parts.append(f"<p>Total effort required: {est.get('original_effort')} person-months</p>")
+    parts.append(f"<p>Team size: {est.get('final_people')} people</p>")
+    parts.append(f"<p>Timeline: {est.get('final_schedule_months')} months</p>")
+    parts.append(f"<p>Average monthly cost: ${est.get('average_monthly_cost'):,}/month</p>")
+    if est.get('premium_multiplier') and est['premium_multiplier'] > 1.0:
+        parts.append(f"<p>Cost premium: +{int((est.get('premium_multiplier')-1.0)*100)}% for aggressive timeline</p>")
+    maint = est.get('maintenance')
+    if maint:
+        parts.append('<h3>Maintenance &amp; TCO</h3>')
+        parts.append(f"<p>Annual Maintenance: ${maint['annual_maintenance']:,}</p>")
+        parts.append(f"<p>Total Maintenance ({maint['maintenance_years']}yr): ${maint['total_maintenance']:,}</p>")
+        parts.append(f"<p>Total Cost of Ownership: ${maint['tco']:,}</p>")
+    parts.append('</body></html>')
     with open(html_path, 'w', encoding='utf-8') as fh:
-        fh.write('<html><head><meta charset="utf-8"><title>Repo Analysis</title></head><body>')
-        fh.write('<h1>Repository Code Analysis</h1>')
-        fh.write('<table border="1" cellpadding="6" cellspacing="0">')
-        fh.write('<tr><th>Language</th><th>Files</th><th>Lines</th><th>Blanks</th><th>Comments</th><th>Code</th><th>Complexity</th><th>Bytes</th></tr>')
-        for L, s in sorted(lang_summary.items(), key=lambda kv: -kv[1]['Code']):
-            fh.write(f"<tr><td>{L}</td><td>{s['Files']}</td><td>{s['Lines']}</td><td>{s['Blanks']}</td><td>{s['Comments']}</td><td>{s['Code']}</td><td>{s['Complexity']}</td><td>{s['Bytes']}</td></tr>")
-        fh.write('</table>')
-        fh.write('<h2>Totals</h2>')
-        fh.write(f"<p>Files: {totals['Files']} &nbsp; Lines: {totals['Lines']} &nbsp; Code: {totals['Code']}</p>")
-        fh.write('<h2>Estimate</h2>')
-        fh.write(f"<p>Estimated Cost (USD): ${est.get('realistic_cost_usd', est.get('estimated_cost_usd')):,}</p>")
-        fh.write(f"<p>Estimated Schedule (months): {est.get('final_schedule_months', est.get('schedule_months'))}</p>")
-        fh.write(f"<p>Estimated People: {est.get('final_people', est.get('people_required'))}</p>")
-        ci = est.get('confidence_interval', {})
-        if ci:
-            fh.write(f"<p>Confidence Range: ${ci.get('low', 0):,} - ${ci.get('high', 0):,}</p>")
-        fh.write('<h3>Realistic Project Breakdown</h3>')
-        fh.write(f"<p>Total effort required: {est.get('original_effort')} person-months</p>")
-        fh.write(f"<p>Team size: {est.get('final_people')} people</p>")
-        fh.write(f"<p>Timeline: {est.get('final_schedule_months')} months</p>")
-        fh.write(f"<p>Average monthly cost: ${est.get('average_monthly_cost'):,}/month</p>")
-        if est.get('premium_multiplier') and est['premium_multiplier'] > 1.0:
-            fh.write(f"<p>Cost premium: +{int((est.get('premium_multiplier')-1.0)*100)}% for aggressive timeline</p>")
-        maint = est.get('maintenance')
-        if maint:
-            fh.write('<h3>Maintenance &amp; TCO</h3>')
-            fh.write(f"<p>Annual Maintenance: ${maint['annual_maintenance']:,}</p>")
-            fh.write(f"<p>Total Maintenance ({maint['maintenance_years']}yr): ${maint['total_maintenance']:,}</p>")
-            fh.write(f"<p>Total Cost of Ownership: ${maint['tco']:,}</p>")
-        fh.write('</body></html>')
+        fh.write(''.join(parts))
 
 
 def write_txt(basepath, lang_summary, totals, est):
     txt_path = basepath + '.txt'
+    # Build the report in memory and write it to disk once
+    buf = io.StringIO()
+    buf.write('\n' + '-' * 79 + '\n')
+    buf.write(TABLE_HEADER + '\n')
+    buf.write('-' * 79 + '\n')
+    for L, s in sorted(lang_summary.items(), key=lambda kv: -kv[1]['Code']):
+        buf.write(format_row(L, s) + '\n')
+    buf.write('-' * 79 + '\n')
+    buf.write(format_row('Total', totals) + '\n')
+    buf.write('-' * 79 + '\n')
+    buf.write(f"Processed {totals['Bytes']:,} bytes, {totals['Bytes'] / 1000000:.3f} megabytes (SI)\n")
+    note = lines_only_note(totals)
+    if note:
+        buf.write(note + '\n')
+    buf.write('-' * 79 + '\n\n')
+    buf.write(f"Estimated Cost to Develop (realistic) ${est.get('realistic_cost_usd', est.get('estimated_cost_usd')):,}\n")
+    buf.write(f"Estimated Schedule Effort (realistic) {est.get('final_schedule_months', est.get('schedule_months'))} months ({est.get('final_schedule_months', est.get('schedule_months')) / 12:.1f} years)\n")
+    buf.write(f"Estimated People Required (realistic) {est.get('final_people', est.get('people_required'))}\n")
+    ci = est.get('confidence_interval', {})
+    if ci:
+        buf.write(f"Confidence Range: ${ci.get('low', 0):,} - ${ci.get('high', 0):,}\n")
+    buf.write('\nRealistic Project Breakdown:\n')
+    buf.write(f"  Total effort required: {est.get('original_effort')} person-months\n")
+    buf.write(f"  Team size: {est.get('final_people')} people\n")
+    buf.write(f"  Timeline: {est.get('final_schedule_months')} months\n")
+    if est.get('premium_multiplier') and est['premium_multiplier'] > 1.0:
+        buf.write(f"  Cost premium: +{int((est.get('premium_multiplier')-1.0)*100)}% for aggressive timeline\n")
+        buf.write(f"  Premium covers: Senior/expert engineers, overtime, consultants, accelerated tooling\n")
+    buf.write(f"  Average monthly cost: ${est.get('average_monthly_cost'):,}/month\n")
+    maint = est.get('maintenance')
+    if maint:
+        buf.write(f"\nMaintenance & TCO:\n")
+        buf.write(f"  Annual Maintenance: ${maint['annual_maintenance']:,}\n")
+        buf.write(f"  Total Maintenance ({maint['maintenance_years']}yr): ${maint['total_maintenance']:,}\n")
+        buf.write(f"  Total Cost of Ownership: ${maint['tco']:,}\n")
     with open(txt_path, 'w', encoding='utf-8') as fh:
-        fh.write('\n' + '-' * 79 + '\n')
-        fh.write(f"{ 'Language':<20} { 'Files':>9} { 'Lines':>9} { 'Blanks':>9} { 'Comments':>9} { 'Code':>9} { 'Complexity':>10}\n")
-        fh.write('-' * 79 + '\n')
-        for L, s in sorted(lang_summary.items(), key=lambda kv: -kv[1]['Code']):
-            fh.write(f"{L:<20} {s['Files']:9d} {s['Lines']:9d} {s['Blanks']:9d} {s['Comments']:9d} {s['Code']:9d} {s['Complexity']:10d}\n")
-        fh.write('-' * 79 + '\n')
-        fh.write(f"{'Total':<20} {totals['Files']:9d} {totals['Lines']:9d} {totals['Blanks']:9d} {totals['Comments']:9d} {totals['Code']:9d} {totals['Complexity']:10d}\n")
-        fh.write('-' * 79 + '\n')
-        fh.write(f"Processed {totals['Bytes']:,} bytes, {totals['Bytes'] / 1000000:.3f} megabytes (SI)\n")
-        fh.write('-' * 79 + '\n\n')
-        fh.write(f"Estimated Cost to Develop (realistic) ${est.get('realistic_cost_usd', est.get('estimated_cost_usd')):,}\n")
-        fh.write(f"Estimated Schedule Effort (realistic) {est.get('final_schedule_months', est.get('schedule_months'))} months ({est.get('final_schedule_months', est.get('schedule_months')) / 12:.1f} years)\n")
-        fh.write(f"Estimated People Required (realistic) {est.get('final_people', est.get('people_required'))}\n")
-        ci = est.get('confidence_interval', {})
-        if ci:
-            fh.write(f"Confidence Range: ${ci.get('low', 0):,} - ${ci.get('high', 0):,}\n")
-        fh.write('\nRealistic Project Breakdown:\n')
-        fh.write(f"  Total effort required: {est.get('original_effort')} person-months\n")
-        fh.write(f"  Team size: {est.get('final_people')} people\n")
-        fh.write(f"  Timeline: {est.get('final_schedule_months')} months\n")
-        if est.get('premium_multiplier') and est['premium_multiplier'] > 1.0:
-            fh.write(f"  Cost premium: +{int((est.get('premium_multiplier')-1.0)*100)}% for aggressive timeline\n")
-            fh.write(f"  Premium covers: Senior/expert engineers, overtime, consultants, accelerated tooling\n")
-        fh.write(f"  Average monthly cost: ${est.get('average_monthly_cost'):,}/month\n")
-        maint = est.get('maintenance')
-        if maint:
-            fh.write(f"\nMaintenance & TCO:\n")
-            fh.write(f"  Annual Maintenance: ${maint['annual_maintenance']:,}\n")
-            fh.write(f"  Total Maintenance ({maint['maintenance_years']}yr): ${maint['total_maintenance']:,}\n")
-            fh.write(f"  Total Cost of Ownership: ${maint['tco']:,}\n")
+        fh.write(buf.getvalue())
 
 
 def write_outputs(basepath, formats, lang_summary, totals, est):
@@ -301,43 +538,66 @@ def estimate_shiny_cost(code_lines, complexity='medium', team_experience=4, reus
         raise ValueError("code_lines must be a non-negative number")
     if complexity not in ('low', 'medium', 'high'):
         raise ValueError("complexity must be 'low', 'medium', or 'high'")
-    if not (1 <= team_experience <= 5):
-        raise ValueError("team_experience must be between 1 and 5")
-    if not (0.7 <= reuse_factor <= 1.3):
-        raise ValueError("reuse_factor must be between 0.7 and 1.3")
-    if not (0.8 <= tool_support <= 1.2):
-        raise ValueError("tool_support must be between 0.8 and 1.2")
-    if not (0.82 <= rely <= 1.26):
-        raise ValueError("rely must be between 0.82 and 1.26")
-    if not (0.73 <= cplx <= 1.74):
-        raise ValueError("cplx must be between 0.73 and 1.74")
-    if not (0.95 <= ruse <= 1.24):
-        raise ValueError("ruse must be between 0.95 and 1.24")
-    if not (0.81 <= pcon <= 1.29):
-        raise ValueError("pcon must be between 0.81 and 1.29")
-    if not (0.81 <= apex <= 1.22):
-        raise ValueError("apex must be between 0.81 and 1.22")
-    if not (0 <= maintenance_rate <= 1):
-        raise ValueError("maintenance_rate must be between 0 and 1")
+    # Values are looked up by name; a range without a matching argument
+    # raises KeyError instead of silently checking the wrong value
+    values = {
+        'team_experience': team_experience, 'reuse_factor': reuse_factor,
+        'tool_support': tool_support, 'rely': rely, 'cplx': cplx, 'ruse': ruse,
+        'pcon': pcon, 'apex': apex, 'maintenance_rate': maintenance_rate
+    }
+    for name, (low, high) in PARAM_RANGES.items():
+        value = values[name]
+        if not (low <= value <= high):
+            raise ValueError(f"{name} must be between {low} and {high}")
     if maintenance_years < 0:
         raise ValueError("maintenance_years must be non-negative")
 
-    A = 2.50
-    B = {'low': 1.02, 'medium': 1.10, 'high': 1.18}.get(complexity, 1.10)
+    # Repeated parameter sets are served from an LRU cache; language_mix is
+    # passed as an ordered tuple of items so the arguments are hashable, and
+    # each caller gets its own copy of the cached result
+    mix = tuple(language_mix.items()) if language_mix else None
+    args = (code_lines, complexity, team_experience, reuse_factor, tool_support, mix,
+            avg_wage, max_team_size, max_schedule_months, rely, cplx, ruse, pcon, apex,
+            maintenance_rate, maintenance_years)
+    try:
+        hash(args)
+    except TypeError:
+        # Unhashable arguments bypass the cache and fail (or not) exactly
+        # as an uncached call would
+        return _estimate_shiny_cost.__wrapped__(*args)
+    return _copy_estimate(_estimate_shiny_cost(*args))
+
+
+def _copy_estimate(result):
+    # Cheaper than copy.deepcopy, which costs more than recomputing
+    copied = dict(result)
+    for key in ('confidence_interval', 'multiplier_breakdown', 'params'):
+        copied[key] = dict(result[key])
+    maint = result['maintenance']
+    if maint:
+        copied['maintenance'] = dict(maint, yearly_costs=list(maint['yearly_costs']))
+    return copied
 
-    lang_productivity = {
-        'R': 1.0, 'Python': 1.1, 'SQL': 1.3, 'JavaScript': 0.9,
-        'CSS': 1.2, 'HTML': 1.3, 'Markdown': 1.5, 'Quarto': 1.5, 'YAML': 1.5, 'JSON': 1.5
-    }
+
+@lru_cache(maxsize=256, typed=True)
+def _estimate_shiny_cost(code_lines, complexity, team_experience, reuse_factor, tool_support,
+                         language_mix, avg_wage, max_team_size, max_schedule_months,
+                         rely, cplx, ruse, pcon, apex, maintenance_rate, maintenance_years):
+    # Arguments are validated by estimate_shiny_cost before the cache lookup
+    A = 2.50
+    B = B_TABLE[complexity]
 
     if language_mix:
         weighted = 0.0
-        for lang, lines in language_mix.items():
-            prod = lang_productivity.get(lang, 1.0)
+        for lang, lines in language_mix:
+            prod = LANG_PRODUCTIVITY.get(lang, 1.0)
             weighted += (lines / prod)
         KLOC = weighted / 1000.0
     else:
         KLOC = code_lines / 1000.0
+    # ** would return a complex number here where math.pow raised
+    if KLOC < 0:
+        raise ValueError("language_mix line counts must not sum to a negative weight")
 
     EM_experience = 1.2 - 0.05 * team_experience
     EM_reuse = reuse_factor
@@ -354,12 +614,12 @@ def estimate_shiny_cost(code_lines, complexity='medium', team_experience=4, reus
     EM_total = (EM_experience * EM_reuse * EM_tools * EM_modern *
                 EM_rely * EM_cplx * EM_ruse * EM_pcon * EM_apex)
 
-    base_effort = A * pow(KLOC, B)
+    base_effort = A * KLOC ** B
     effort = base_effort * EM_total
 
     C = 3.50
-    D = 0.28 + 0.2 * (B - 1.01)
-    schedule = C * pow(effort, D)
+    D = D_TABLE[complexity]
+    schedule = C * effort ** D
     people = effort / schedule if schedule > 0 else effort
 
     cost = round(effort * 12000)
@@ -541,6 +801,16 @@ def print_realistic_breakdown(est):
         print(f"  Confidence range: ${ci.get('low', 0):,} - ${ci.get('high', 0):,}")
 
 
+def _non_negative_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be a non-negative integer, got {value!r}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description='Repo analyzer and cost estimator')
     sub = parser.add_subparsers(dest='cmd')
@@ -561,6 +831,12 @@ def main():
     p_analyze.add_argument('--maintenance-years', type=int, default=0)
     p_analyze.add_argument('--out', help='Base path to write outputs (without extension)')
     p_analyze.add_argument('--formats', nargs='+', choices=['csv', 'html', 'txt'], default=['txt'])
+    p_analyze.add_argument('--force-python', action='store_true',
+                           help='Count lines in Python even if scc is installed')
+    p_analyze.add_argument('--processes', action='store_true',
+                           help='Analyze files on a process pool instead of threads')
+    p_analyze.add_argument('--max-bytes', type=_non_negative_int, default=DEFAULT_MAX_BYTES,
+                           help='Only count lines in files larger than this (0 for no limit)')
 
     p_est = sub.add_parser('estimate')
     p_est.add_argument('--lines', type=int, required=True, help='Total code lines')
@@ -580,7 +856,8 @@ def main():
     args = parser.parse_args()
 
     if args.cmd == 'analyze':
-        result = analyze_repo(args.path)
+        result = analyze_repo(args.path, force_python=args.force_python,
+                              processes=args.processes, max_bytes=args.max_bytes)
         if result:
             lang_summary, totals = result
             language_mix = {L: stats['Code'] for L, stats in lang_summary.items()}
@@ -0,0 +1,201 @@
+# Tests for Python/repo_code_analyzer.py
+# Usage: python3 -m unittest discover -s tests (from project root)
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Python'))
+
+import repo_code_analyzer as rca
+
+
+class EstimateCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        rca._estimate_shiny_cost.cache_clear()
+
+    def test_cache_hit_returns_equal_result(self):
+        first = rca.estimate_shiny_cost(10000, maintenance_years=3)
+        second = rca.estimate_shiny_cost(10000, maintenance_years=3)
+        self.assertEqual(first, second)
+        self.assertEqual(rca._estimate_shiny_cost.cache_info().hits, 1)
+
+    def test_mutating_a_result_does_not_leak_into_the_next_call(self):
+        kwargs = dict(language_mix={'R': 6000, 'Python': 4000}, maintenance_years=3)
+        expected = rca.estimate_shiny_cost(10000, **kwargs)
+        rca._estimate_shiny_cost.cache_clear()
+
+        first = rca.estimate_shiny_cost(10000, **kwargs)
+        first['realistic_cost_usd'] = -1
+        first['params']['complexity'] = 'mutated'
+        first['confidence_interval']['low'] = -1
+        first['multiplier_breakdown']['EM_total'] = -1
+        first['maintenance']['yearly_costs'].append(-1)
+        first['maintenance']['tco'] = -1
+
+        second = rca.estimate_shiny_cost(10000, **kwargs)
+        self.assertEqual(rca._estimate_shiny_cost.cache_info().hits, 1)
+        self.assertEqual(second, expected)
+
+    def test_language_mix_values_are_part_of_the_key(self):
+        small = rca.estimate_shiny_cost(10000, language_mix={'R': 1000})
+        large = rca.estimate_shiny_cost(10000, language_mix={'R': 50000})
+        self.assertLess(small['effort_person_months'], large['effort_person_months'])
+
+
+class EstimateValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        rca._estimate_shiny_cost.cache_clear()
+
+    def test_unhashable_code_lines_raises_value_error(self):
+        with self.assertRaisesRegex(ValueError, 'code_lines must be a non-negative number'):
+            rca.estimate_shiny_cost([1])
+
+    def test_unhashable_complexity_raises_value_error(self):
+        with self.assertRaisesRegex(ValueError, "complexity must be 'low', 'medium', or 'high'"):
+            rca.estimate_shiny_cost(10000, complexity=['medium'])
+
+    def test_unhashable_range_argument_fails_its_comparison(self):
+        with self.assertRaises(TypeError) as ctx:
+            rca.estimate_shiny_cost(10000, rely=[1])
+        self.assertNotIn('unhashable', str(ctx.exception))
+
+    def test_unhashable_unvalidated_argument_bypasses_the_cache(self):
+        with self.assertRaises(TypeError) as ctx:
+            rca.estimate_shiny_cost(10000, avg_wage=[105000])
+        self.assertNotIn('unhashable', str(ctx.exception))
+        with self.assertRaises(TypeError) as ctx:
+            rca.estimate_shiny_cost(10000, language_mix={'R': [1000]})
+        self.assertNotIn('unhashable', str(ctx.exception))
+
+    def test_validation_order(self):
+        with self.assertRaisesRegex(ValueError, 'code_lines'):
+            rca.estimate_shiny_cost(-1, complexity='invalid', rely=0)
+        with self.assertRaisesRegex(ValueError, 'complexity'):
+            rca.estimate_shiny_cost(10000, complexity='invalid', rely=0)
+        with self.assertRaisesRegex(ValueError, 'team_experience must be between 1 and 5'):
+            rca.estimate_shiny_cost(10000, team_experience=0, rely=0)
+        with self.assertRaisesRegex(ValueError, 'rely must be between 0.82 and 1.26'):
+            rca.estimate_shiny_cost(10000, rely=0, maintenance_rate=2)
+        with self.assertRaisesRegex(ValueError, 'maintenance_rate must be between 0 and 1'):
+            rca.estimate_shiny_cost(10000, maintenance_rate=2, maintenance_years=-1)
+        with self.assertRaisesRegex(ValueError, 'maintenance_years must be non-negative'):
+            rca.estimate_shiny_cost(10000, maintenance_years=-1)
+
+    def test_every_range_is_enforced(self):
+        for name, (low, high) in rca.PARAM_RANGES.items():
+            with self.subTest(name=name):
+                with self.assertRaisesRegex(ValueError, name):
+                    rca.estimate_shiny_cost(10000, **{name: high + 1})
+                with self.assertRaisesRegex(ValueError, name):
+                    rca.estimate_shiny_cost(10000, **{name: low - 1})
+
+    def test_negative_language_mix_total_raises_value_error(self):
+        with self.assertRaisesRegex(ValueError, 'language_mix'):
+            rca.estimate_shiny_cost(10000, language_mix={'R': -5000})
+
+    def test_mixed_sign_language_mix_with_positive_total_still_estimates(self):
+        result = rca.estimate_shiny_cost(10000, language_mix={'R': -10, 'Python': 5000})
+        self.assertIsInstance(result['effort_person_months'], float)
+        self.assertGreater(result['realistic_cost_usd'], 0)
+
+
+class MaxBytesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as fh:
+            fh.write(data)
+        return path
+
+    def analyze(self, path, max_bytes):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            result = rca.analyze_repo(path, force_python=True, max_bytes=max_bytes)
+        return result, out.getvalue()
+
+    def test_max_bytes_parsing(self):
+        self.assertEqual(rca._non_negative_int('0'), 0)
+        self.assertEqual(rca._non_negative_int('5000000'), 5000000)
+        for value in ('-1', 'abc', '1.5'):
+            with self.subTest(value=value):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    rca._non_negative_int(value)
+
+    def test_cli_rejects_negative_max_bytes(self):
+        argv = ['repo_code_analyzer.py', 'analyze', self.tmp.name, '--force-python',
+                '--max-bytes', '-1']
+        with mock.patch.object(sys, 'argv', argv), \
+                contextlib.redirect_stderr(io.StringIO()) as err:
+            with self.assertRaises(SystemExit) as ctx:
+                rca.main()
+        self.assertEqual(ctx.exception.code, 2)
+        self.assertIn('must be a non-negative integer', err.getvalue())
+
+    def test_lines_only_count_matches_full_count(self):
+        # Small chunks force the slice loop across many boundaries
+        cases = {
+            'trailing.js': b'a = 1;\n\n// note\n' * 50,
+            'no_newline.js': b'a = 1;\n\n// note\n' * 50 + b'tail',
+            'one_line.js': b'x' * 100,
+        }
+        with mock.patch.object(rca, 'LINE_COUNT_CHUNK', 7):
+            for name, data in cases.items():
+                with self.subTest(name=name):
+                    path = self.write(name, data)
+                    full = rca._analyze_file(path, name, len(data), 0)
+                    limited = rca._analyze_file(path, name, len(data), 10)
+                    self.assertEqual(limited[1], full[1])
+                    self.assertEqual(limited, ('JavaScript', full[1], 0, 0, 0, 0, len(data)))
+
+    def test_files_at_the_limit_are_fully_analyzed(self):
+        data = b'x = 1\n# c\n\n'
+        path = self.write('a.py', data)
+        self.assertEqual(rca._analyze_file(path, 'a.py', len(data), len(data)),
+                         rca._analyze_file(path, 'a.py', len(data), 0))
+
+    def test_lines_only_files_add_no_code_and_are_noted(self):
+        self.write('big.js', b'a = 1;\n\n// note\n' * 100)
+        self.write('small.py', b'x = 1\n# c\n\n')
+        (lang_summary, totals), console = self.analyze(self.tmp.name, 500)
+
+        self.assertEqual(lang_summary['JavaScript']['Lines'], 300)
+        self.assertEqual(lang_summary['JavaScript']['Code'], 0)
+        self.assertEqual(lang_summary['Python']['Code'], 1)
+        self.assertEqual(totals['LinesOnlyFiles'], 1)
+        note = rca.lines_only_note(totals)
+        self.assertIn('1 file(s) over 500 bytes', note)
+        self.assertIn(note, console)
+
+        base = os.path.join(self.tmp.name, 'report')
+        est = rca.estimate_shiny_cost(totals['Code'])
+        rca.write_outputs(base, ['csv', 'html', 'txt'], lang_summary, totals, est)
+        for ext in ('.csv', '.html', '.txt'):
+            with self.subTest(ext=ext):
+                with open(base + ext, encoding='utf-8') as fh:
+                    self.assertIn(note, fh.read())
+        # The txt table is the console table
+        with open(base + '.txt', encoding='utf-8') as fh:
+            self.assertTrue(fh.read().startswith(console.rstrip('\n')))
+
+    def test_no_note_without_lines_only_files(self):
+        self.write('small.py', b'x = 1\n# c\n\n')
+        (lang_summary, totals), console = self.analyze(self.tmp.name, 0)
+        self.assertEqual(totals['LinesOnlyFiles'], 0)
+        self.assertIsNone(rca.lines_only_note(totals))
+        self.assertNotIn('Counted only lines', console)
+
+
+if __name__ == '__main__':
+    unittest.main()